@@ -10,12 +10,95 @@ Implements multiple evaluation metrics for rare disease articles' content:
 
 from rouge_score import rouge_scorer
 from transformers import pipeline
+import torch
 import re
+import hashlib
+import threading
+from collections import OrderedDict
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Set, Tuple, Optional
 from prometheus_evaluator import load_prometheus_model, evaluate_all_aspects
 
+# Precompiled patterns used by the text helpers below
+_SENT_SPLIT_RE = re.compile(r'[.!?]\s+')
+_CITATION_RE = re.compile(r'\[(\d+)\]')  # Matches [n] or [n][m] etc.
+_EDIT_RE = re.compile(r'\[edit\]')
+_JUMP_RE = re.compile(r'Jump to.*?hide', re.DOTALL)
+_NL_RE = re.compile(r'\n{3,}')
+_WS_RE = re.compile(r' {2,}')
+
+# One scorer for the module, built once instead of per call
+_ROUGE_SCORER = rouge_scorer.RougeScorer(['rouge1', 'rouge2', 'rougeL'], use_stemmer=True)
+
+NER_MODEL_ID = "dslim/bert-base-NER"  # High-quality NER model from Hugging Face
+NER_BATCH_SIZE = 32
+NER_CORPUS_BATCH_SIZE = 64  # Larger batches keep the GPU busy across many articles
+NER_NUM_WORKERS = 2  # DataLoader workers tokenize upcoming batches while the GPU runs the current one
+
+# Lazily loaded models, shared across calls
+_ner_pipelines: Dict[str, object] = {}
+_prometheus_model: Optional[Tuple[object, object]] = None
+_model_lock = threading.Lock()
+
+# Shared HTTP session so repeated Wikipedia fetches reuse keep-alive connections
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': 'Article-Evaluator/1.0 (Educational Research)'})
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True
+    )
+))
+
+# Entity sets keyed by (blake2b digest of text, NER model id)
+_ENTITY_CACHE_SIZE = 8
+_entity_cache: "OrderedDict[Tuple[str, str], frozenset]" = OrderedDict()
+
+
+def get_ner_pipeline(model_id: str = NER_MODEL_ID):
+    """
+    Load the Hugging Face NER pipeline once and reuse it on later calls.
+    
+    Args:
+        model_id: Hugging Face Hub model id
+    
+    Returns:
+        Hugging Face NER pipeline
+    """
+    with _model_lock:
+        if model_id not in _ner_pipelines:
+            _ner_pipelines[model_id] = pipeline(
+                "ner",
+                model=model_id,
+                aggregation_strategy="simple",
+                batch_size=NER_BATCH_SIZE,
+                device=0 if torch.cuda.is_available() else -1,  # Use GPU when available
+                torch_dtype=torch.float16 if torch.cuda.is_available() else torch.float32
+            )
+        return _ner_pipelines[model_id]
+
+
+def get_prometheus_model():
+    """
+    Load the Prometheus model and tokenizer once and reuse them on later calls.
+    
+    Returns:
+        Tuple of (model, tokenizer)
+    """
+    global _prometheus_model
+    with _model_lock:
+        if _prometheus_model is None:
+            _prometheus_model = load_prometheus_model()
+        return _prometheus_model
+
 
 def calculate_rouge_scores(generated_article: str, reference_article: str) -> Dict[str, float]:
     """
@@ -28,9 +111,7 @@ def calculate_rouge_scores(generated_article: str, reference_article: str) -> Di
     Returns:
         Dictionary with ROUGE-1, ROUGE-2, and ROUGE-L F1 scores
     """
-    scorer = rouge_scorer.RougeScorer(['rouge1', 'rouge2', 'rougeL'], use_stemmer=True)
-    scores = scorer.score(reference_article, generated_article)
-    
+    scores = _ROUGE_SCORER.score(reference_article, generated_article)
     return {
         'rouge1': scores['rouge1'].fmeasure,
         'rouge2': scores['rouge2'].fmeasure,
@@ -38,62 +119,227 @@ def calculate_rouge_scores(generated_article: str, reference_article: str) -> Di
     }
 
 
+def sort_by_token_length(sentences: List[str], tokenizer) -> List[str]:
+    """
+    Order sentences by tokenized length so each batch pads to a similar length.
+    
+    Args:
+        sentences: Sentences to be batched
+        tokenizer: Tokenizer of the model the batches are fed to
+    
+    Returns:
+        Sentences sorted from shortest to longest token count
+    """
+    return [sentences[i] for i in token_length_order(sentences, tokenizer)]
+
+
+def token_length_order(sentences: List[str], tokenizer) -> List[int]:
+    """Indices of sentences from shortest to longest token count (input order without a tokenizer)."""
+    if tokenizer is None or not sentences:
+        return list(range(len(sentences)))
+    lengths = tokenizer(sentences, add_special_tokens=False, return_length=True)['length']
+    return sorted(range(len(sentences)), key=lengths.__getitem__)
+
+
+def _split_sentences(text: str) -> List[str]:
+    """Split text into sentences, dropping fragments too short to tag."""
+    return [s for s in _SENT_SPLIT_RE.split(text) if len(s.strip()) >= 3]
+
+
+def _normalized_entities(results: List[dict]) -> set:
+    """Lower-cased, stripped entity strings from one sentence's NER results."""
+    entities = set()
+    for result in results:
+        entity_text = result.get('word', result.get('entity_group', '')).strip().lower()
+        if len(entity_text) > 1:
+            entities.add(entity_text)
+    return entities
+
+
+def _entity_cache_key(text: str, ner_pipeline) -> Tuple[str, str]:
+    """Key the entity cache by text digest and the pipeline's model id."""
+    model_id = getattr(getattr(ner_pipeline, 'model', None), 'name_or_path', None) or str(id(ner_pipeline))
+    return (hashlib.blake2b(text.encode('utf-8')).hexdigest(), model_id)
+
+
+def _get_entities(cache_key: Tuple[str, str]) -> Optional[set]:
+    """Return a copy of a memoized entity set, marking it most recently used."""
+    cached = _entity_cache.get(cache_key)
+    if cached is None:
+        return None
+    _entity_cache.move_to_end(cache_key)
+    return set(cached)
+
+
+def _store_entities(cache_key: Tuple[str, str], entities: set) -> None:
+    """Memoize a complete entity set, evicting the least recently used entry."""
+    _entity_cache[cache_key] = frozenset(entities)
+    if len(_entity_cache) > _ENTITY_CACHE_SIZE:
+        _entity_cache.popitem(last=False)
+
+
+def iter_entities(text: str, ner_pipeline):
+    """
+    Yield the normalized entities of each sentence batch in text.
+    Sentences are sorted by token length and passed to the pipeline in
+    batches to limit padding. Pipeline errors propagate to the caller.
+    
+    Args:
+        text: Input text
+        ner_pipeline: Hugging Face NER pipeline
+    
+    Yields:
+        Set of lower-cased, stripped entity strings per batch
+    """
+    sentences = _split_sentences(text)
+    if not sentences:
+        return
+    
+    # Entities are collected into sets, so the sorted order never needs undoing
+    sentences = sort_by_token_length(sentences, getattr(ner_pipeline, 'tokenizer', None))
+    for start in range(0, len(sentences), NER_BATCH_SIZE):
+        batch = sentences[start:start + NER_BATCH_SIZE]
+        batch_entities = set()
+        for results in ner_pipeline(batch, batch_size=NER_BATCH_SIZE):
+            batch_entities.update(_normalized_entities(results))
+        yield batch_entities
+
+
 def extract_entities(text: str, ner_pipeline) -> set:
     """
     Extract named entities from text using Hugging Face transformers NER.
+    Results are memoized per (text, model) so repeated calls skip the
+    forward pass.
     
     Args:
         text: Input text
         ner_pipeline: Hugging Face NER pipeline
     
     Returns:
-        Set of unique entity strings
+        Set of unique entity strings (lower-cased and stripped)
     """
-    # Split into sentences for processing
-    sentences = re.split(r'[.!?]\s+', text)
+    cache_key = _entity_cache_key(text, ner_pipeline)
+    cached = _get_entities(cache_key)
+    if cached is not None:
+        return cached
+    
     entities = set()
+    try:
+        for batch_entities in iter_entities(text, ner_pipeline):
+            entities.update(batch_entities)
+    except Exception as e:
+        print(f"Error running NER pipeline: {e}")
+        return entities
+    
+    _store_entities(cache_key, entities)
+    return entities
+
+
+def extract_entities_corpus(texts: List[str], ner_pipeline, batch_size: int = NER_CORPUS_BATCH_SIZE) -> List[set]:
+    """
+    Extract named entities for many articles in a single streamed pipeline pass.
+    Sentences from all uncached articles share length-sorted batches, so
+    short articles don't leave batches half full. On GPU the pipeline's
+    DataLoader prepares upcoming batches while the model runs. Each
+    completed article is stored in the entity cache.
     
-    for sent in sentences:
-        if len(sent.strip()) < 3:
-            continue
+    Args:
+        texts: Article texts
+        ner_pipeline: Hugging Face NER pipeline
+        batch_size: Sentences per forward pass
+    
+    Returns:
+        List of entity sets, one per input text
+    """
+    keys = [_entity_cache_key(text, ner_pipeline) for text in texts]
+    entity_sets = []
+    uncached = []
+    owners = []  # Article index of each pending sentence
+    sentences = []
+    for i, (text, key) in enumerate(zip(texts, keys)):
+        cached = _get_entities(key)
+        entity_sets.append(cached if cached is not None else set())
+        if cached is None:
+            uncached.append(i)
+            article_sentences = _split_sentences(text)
+            owners.extend([i] * len(article_sentences))
+            sentences.extend(article_sentences)
+    
+    if sentences:
+        order = token_length_order(sentences, getattr(ner_pipeline, 'tokenizer', None))
+        # Prefetch only helps when tokenization can overlap a GPU forward pass; on CPU workers just compete for cores
+        on_gpu = getattr(getattr(ner_pipeline, 'device', None), 'type', None) == 'cuda'
         try:
-            results = ner_pipeline(sent)
-            for result in results:
-                entity_text = result.get('word', result.get('entity_group', ''))
-                if entity_text and len(entity_text.strip()) > 1:
-                    entities.add(entity_text.strip())
-        except Exception:
-            continue  # Skip if processing fails
+            outputs = ner_pipeline([sentences[j] for j in order], batch_size=batch_size,
+                                   num_workers=NER_NUM_WORKERS if on_gpu else 0)
+            for j, results in zip(order, outputs):
+                entity_sets[owners[j]].update(_normalized_entities(results))
+        except Exception as e:
+            print(f"Error running NER pipeline: {e}")
+            return entity_sets
     
-    return entities
+    for i in uncached:
+        _store_entities(keys[i], entity_sets[i])
+    
+    return entity_sets
 
 
-def calculate_entity_recall(generated_article: str, reference_article: str, tagger) -> float:
+def calculate_entity_recall(generated_article: str, reference_article: str, tagger,
+                            stop_early: bool = True) -> Tuple[float, set, set, set]:
     """
     Calculate entity recall: proportion of reference entities found in generated article.
+    The generated article is tagged batch by batch and, with stop_early,
+    tagging stops as soon as every reference entity has been matched.
     
     Args:
         generated_article: The generated article text
         reference_article: The reference article text
-        tagger: FLAIR SequenceTagger model
+        tagger: Hugging Face NER pipeline
+        stop_early: Stop tagging once recall is settled; pass False when the
+            full generated entity set is needed
     
     Returns:
-        Entity recall score (0.0 to 1.0)
+        Tuple of (entity recall score from 0.0 to 1.0, reference entities,
+        generated entities, matched entities). With stop_early, generated
+        entities only cover the batches tagged before the stop.
     """
     reference_entities = extract_entities(reference_article, tagger)
-    generated_entities = extract_entities(generated_article, tagger)
     
-    if len(reference_entities) == 0:
-        return 1.0 if len(generated_entities) == 0 else 0.0
+    cache_key = _entity_cache_key(generated_article, tagger)
+    cached = _get_entities(cache_key)
+    if cached is not None:
+        generated_batches = [cached]
+    else:
+        generated_batches = iter_entities(generated_article, tagger)
     
-    # Calculate recall: entities in both sets / total reference entities
-    matched_entities = reference_entities.intersection(generated_entities)
-    recall = len(matched_entities) / len(reference_entities)
+    # Accumulate matches incrementally: entities in both sets / total reference entities
+    generated_entities = set()
+    matched_entities = set()
+    exhausted = True
+    try:
+        for batch_entities in generated_batches:
+            generated_entities.update(batch_entities)
+            matched_entities.update(batch_entities & reference_entities)
+            # Stop early once everything is matched (or, with no reference entities, once any entity is found)
+            if stop_early and len(matched_entities) == len(reference_entities) and generated_entities:
+                exhausted = False
+                break
+    except Exception as e:
+        print(f"Error running NER pipeline: {e}")
+        exhausted = False
+    
+    if exhausted and cached is None:
+        _store_entities(cache_key, generated_entities)
+    
+    if len(reference_entities) == 0:
+        recall = 1.0 if len(generated_entities) == 0 else 0.0
+    else:
+        recall = len(matched_entities) / len(reference_entities)
     
-    return recall
+    return recall, reference_entities, generated_entities, matched_entities
 
 
-def extract_citations(text: str) -> List[str]:
+def extract_citations(text: str) -> Set[str]:
     """
     Extract citation markers from text (e.g., [1], [2], [1][2]).
     
@@ -101,12 +347,9 @@ def extract_citations(text: str) -> List[str]:
         text: Article text with citations
     
     Returns:
-        List of unique citation numbers as strings
+        Set of unique citation numbers as strings
     """
-    # Pattern matches [n] or [n][m] etc.
-    citation_pattern = r'\[(\d+)\]'
-    citations = re.findall(citation_pattern, text)
-    return list(set(citations))
+    return set(_CITATION_RE.findall(text))
 
 
 
@@ -133,35 +376,23 @@ def fetch_wikipedia_article(url: str) -> Optional[str]:
         # If that doesn't work, fall back to HTML parsing
         api_url = f"https://en.wikipedia.org/api/rest_v1/page/html/{page_name}"
         
-        response = requests.get(
-            api_url, 
-            headers={'User-Agent': 'Article-Evaluator/1.0 (Educational Research)'},
-            timeout=10
-        )
+        response = SESSION.get(api_url, timeout=(5, 30))  # (connect, read) seconds
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove navigation, references, and other non-content elements
-        for element in soup.find_all(['nav', 'aside', 'style', 'script', 'link']):
-            element.decompose()
-        
-        # Remove citation references (they're in <sup> tags with class 'reference')
-        for sup in soup.find_all('sup', class_='reference'):
-            sup.decompose()
+        soup = BeautifulSoup(response.content, 'lxml')
         
-        # Remove infoboxes and tables (they're not part of main content for evaluation)
-        for table in soup.find_all('table'):
-            # Keep some tables if they're informative, but remove navigation boxes
-            if 'infobox' in table.get('class', []):
-                table.decompose()
+        # Remove navigation, citation references (<sup class="reference">) and
+        # infoboxes in one CSS-selected pass; they're not main content for evaluation
+        for element in soup.select('nav, aside, style, script, link, sup.reference, table.infobox'):
+            if not element.decomposed:  # May already be gone with a removed ancestor
+                element.decompose()
         
         # Extract text from main content
         # Wikipedia HTML structure: main content is in <body>
         main_content = soup.find('body')
         if main_content:
-            # Get all paragraph and heading text
-            paragraphs = main_content.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li'])
+            # Get all paragraph and heading text, in document order
+            paragraphs = main_content.select('p, h1, h2, h3, h4, h5, h6, li')
             text_parts = []
             for p in paragraphs:
                 text = p.get_text(separator=' ', strip=True)
@@ -189,12 +420,12 @@ def clean_wikipedia_text(text: str) -> str:
         Cleaned text
     """
     # Remove edit links and other Wikipedia-specific markers
-    text = re.sub(r'\[edit\]', '', text)
-    text = re.sub(r'Jump to.*?hide', '', text, flags=re.DOTALL)
+    text = _EDIT_RE.sub('', text)
+    text = _JUMP_RE.sub('', text)
     
     # Remove excessive whitespace
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r' {2,}', ' ', text)
+    text = _NL_RE.sub('\n\n', text)
+    text = _WS_RE.sub(' ', text)
     
     return text.strip()
 
@@ -233,20 +464,15 @@ if __name__ == "__main__":
         try:
             # Load model directly from Hugging Face Hub - cached but not permanently stored
             # Using a high-quality NER model similar to FLAIR's capabilities
-            ner_pipeline = pipeline(
-                "ner", 
-                model="dslim/bert-base-NER",  # High-quality NER model from Hugging Face
-                aggregation_strategy="simple",
-                device=-1  # Use CPU (set to 0 for GPU if available)
+            ner_pipeline = get_ner_pipeline()
+            # Tag both articles in shared batches; calculate_entity_recall then reads the cache
+            extract_entities_corpus([reference_article, generated_article], ner_pipeline)
+            entity_recall, reference_entities, generated_entities, matched_entities = calculate_entity_recall(
+                generated_article, reference_article, ner_pipeline, stop_early=False  # Stats below need every entity
             )
-            entity_recall = calculate_entity_recall(generated_article, reference_article, ner_pipeline)
             print(f"Entity recall: {entity_recall:.4f}")
             
             # Show entity statistics
-            reference_entities = extract_entities(reference_article, ner_pipeline)
-            generated_entities = extract_entities(generated_article, ner_pipeline)
-            matched_entities = reference_entities.intersection(generated_entities)
-            
             print(f"\nEntity statistics:")
             print(f"  Reference entities: {len(reference_entities)}")
             print(f"  Generated entities: {len(generated_entities)}")
@@ -259,7 +485,7 @@ if __name__ == "__main__":
         print("\nEvaluating with Prometheus (Wikipedia criteria)...")
         try:
             print("Loading Prometheus model (this may take a while on first use)...")
-            model, tokenizer = load_prometheus_model()
+            model, tokenizer = get_prometheus_model()
             print("Prometheus model loaded successfully.")
             
             results = evaluate_all_aspects(generated_article, model, tokenizer)
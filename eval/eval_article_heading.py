@@ -1,22 +1,22 @@
 from transformers import AutoTokenizer, AutoModel
 import torch
+import torch.nn.functional as F
 import re
 
 
+_HEADING_RE = re.compile(r'^#{2,}\s+(.+)$', re.MULTILINE)  # All markdown headings (##, ###, ####, etc.)
 
 
 def get_article_headings(article):
     """Get headings from the article (all markdown heading levels)"""
-    # Extract all markdown headings (##, ###, ####, etc.)
-    heading_pattern = r'^#{2,}\s+(.+)$'
-    headings = re.findall(heading_pattern, article, re.MULTILINE)
+    headings = _HEADING_RE.findall(article)
     # Clean up headings (remove extra whitespace)
     headings = [h.strip() for h in headings if h.strip()]
     return headings
 
 #Mean Pooling - take attention mask into account for correct averaging
 def mean_pooling(model_output, attention_mask):
-    token_embeddings = model_output[0] # First element of model_output contains all token embeddings
+    token_embeddings = model_output[0].float() # First element of model_output contains all token embeddings (upcast from half precision)
     input_mask_expanded = attention_mask.unsqueeze(-1).expand(token_embeddings.size()).float()
     return torch.sum(token_embeddings * input_mask_expanded, 1) / torch.clamp(input_mask_expanded.sum(1), min=1e-9)
 
@@ -24,10 +24,10 @@ def mean_pooling(model_output, attention_mask):
 def embed_headings(headings, tokenizer, model):
     """Embed a list of headings"""
     # Tokenize sentences
-    encoded_input = tokenizer(headings, padding=True, truncation=True, return_tensors='pt')
+    encoded_input = tokenizer(headings, padding=True, truncation=True, return_tensors='pt').to(model.device)
     
     # Compute token embeddings
-    with torch.no_grad():
+    with torch.inference_mode():
         model_output = model(**encoded_input)
     
     # Perform pooling
@@ -46,28 +46,28 @@ if __name__ == "__main__":
 
     # Load model from hugging face
     tokenizer = AutoTokenizer.from_pretrained('sentence-transformers/paraphrase-MiniLM-L6-v2')
-    model = AutoModel.from_pretrained('sentence-transformers/paraphrase-MiniLM-L6-v2')
+    # Half precision: float16 on GPU, bfloat16 on CPU
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    dtype = torch.float16 if device == 'cuda' else torch.bfloat16
+    model = AutoModel.from_pretrained('sentence-transformers/paraphrase-MiniLM-L6-v2').to(device=device, dtype=dtype).eval()
 
-    # Embed all headings
-    generated_embeddings = embed_headings(generated_headings, tokenizer, model)  # P embeddings
-    reference_embeddings = embed_headings(reference_headings, tokenizer, model)  # G embeddings
+    # Embed all headings in one padded batch, then split back into G and P
+    all_embeddings = embed_headings(reference_headings + generated_headings, tokenizer, model)
+    reference_embeddings = all_embeddings[:len(reference_headings)]  # G embeddings
+    generated_embeddings = all_embeddings[len(reference_headings):]  # P embeddings
 
     # Calculate soft count for each reference heading
     # For each Gi in G: soft_count(Gi) = 1 / sum(Sim(Gi, Pj) for all Pj in P)
     # Sim(Gi, Pj) = cos(embed(Gi), embed(Pj))
-    soft_counts = []
-    for i, ref_emb in enumerate(reference_embeddings):
-        # Calculate cosine similarity between ref_emb and all generated embeddings
-        similarities = torch.nn.functional.cosine_similarity(
-            ref_emb.unsqueeze(0), generated_embeddings, dim=1
-        )
-        # Soft count = 1 / sum of similarities
-        sum_similarities = torch.sum(similarities)
-        soft_count = 1.0 / (sum_similarities + 1e-9)  # Add small epsilon to avoid division by zero
-        soft_counts.append(soft_count.item())
+    # All pairwise similarities at once: rows are G, columns are P
+    ref_n = F.normalize(reference_embeddings, dim=1)
+    gen_n = F.normalize(generated_embeddings, dim=1)
+    sim = ref_n @ gen_n.T
+    # Soft count = 1 / sum of similarities
+    soft_counts = 1.0 / (sim.sum(dim=1) + 1e-9)  # Add small epsilon to avoid division by zero
 
     # Soft heading recall: average of soft counts
-    soft_heading_recall = sum(soft_counts) / len(soft_counts) if soft_counts else 0.0
+    soft_heading_recall = soft_counts.mean().item() if soft_counts.numel() else 0.0
     
     print(f"Soft heading recall: {soft_heading_recall}")
     print(f"Number of reference headings: {len(reference_headings)}")
@@ -1,13 +1,126 @@
 import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
-import random
-import json
-from bs4 import BeautifulSoup
+import orjson
+import os
+import re
+import functools
+import threading
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import aiohttp
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+from aiolimiter import AsyncLimiter
+from datetime import timedelta
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from urllib.parse import quote
 
-CATEGORY_URL = "https://en.wikipedia.org/wiki/Category:Rare_diseases"
-BASE_URL = "https://en.wikipedia.org/wiki/"
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # Fall back to BeautifulSoup + lxml for disease pages
+    LexborHTMLParser = None
+
+API_URL = "https://en.wikipedia.org/w/api.php"
+CATEGORY_TITLE = "Category:Rare_diseases"
 disease_urls = []
+seen_disease_urls = set()  # O(1) membership check while building disease_urls
+
+# Disease pages are fetched concurrently, but throttled to stay polite to Wikipedia
+MAX_CONCURRENT_REQUESTS = 32
+MAX_CONNECTIONS_PER_HOST = 16
+MAX_REQUESTS_PER_SECOND = 5
+MAX_PARSE_WORKERS = 2  # HTML parsing is CPU-bound, so it runs in worker processes; a few keep up with the request rate
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+# No Accept-Encoding override: requests/urllib3 and aiohttp add `br` themselves once `brotli` is importable
+REQUEST_HEADERS = {'User-Agent': USER_AGENT}
+
+# Responses are cached on disk so reruns skip the network; Wikipedia content changes slowly
+CACHE_EXPIRE_AFTER = timedelta(days=7)
+# Anchored next to this file so every working directory shares one cache
+CACHE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_NAME = os.path.join(CACHE_DIR, 'wiki_cache.sqlite')
+ASYNC_CACHE_NAME = os.path.join(CACHE_DIR, 'wiki_cache_async.sqlite')  # aiohttp-client-cache keeps its own SQLite file
+
+# Transient failures (rate limiting, 5xx, dropped connections) are retried with
+# exponential backoff; a stalled connection fails fast instead of hanging the scrape
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+REQUEST_TIMEOUT = (5, 30)  # (connect, read) seconds
+
+# MediaWiki reports API errors as HTTP 200 with an `error` body and this header.
+# Server-side throttling and lag are transient, so those codes are retried like a 429
+API_ERROR_HEADER = 'MediaWiki-API-Error'
+RETRYABLE_API_ERRORS = frozenset(('maxlag', 'ratelimited', 'readonly'))
+
+
+def is_retryable_api_error(code):
+    return code in RETRYABLE_API_ERRORS or (code or '').startswith('internal_api_error')
+
+
+def retry_delay(attempt, headers):
+    """Exponential backoff for `attempt`, stretched to the server's Retry-After when it asks for longer"""
+    delay = RETRY_BACKOFF * (2 ** attempt)
+    retry_after = headers.get('Retry-After', '')
+    if retry_after.isdigit():
+        delay = max(delay, int(retry_after))
+    return delay
+
+
+def is_cacheable_api_response(response):
+    """requests-cache filter: never store an API error, or a transient one would be replayed for days"""
+    if API_ERROR_HEADER in response.headers:
+        return False
+    try:
+        return 'error' not in orjson.loads(response.content)
+    except orjson.JSONDecodeError:
+        return False
+
+
+# Shared HTTP session: keep-alive reuses TLS connections across the whole scrape.
+# Created on first use, so importing the module (e.g. in parse worker processes) opens no cache
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the shared cached session, creating it on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests_cache.CachedSession(
+                CACHE_NAME,
+                backend='sqlite',
+                expire_after=CACHE_EXPIRE_AFTER,
+                allowable_codes=(200,),
+                filter_fn=is_cacheable_api_response
+            )
+            session.headers.update(REQUEST_HEADERS)
+            # Every request goes to en.wikipedia.org, so one host pool with room for many connections
+            session.mount('https://', HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=64,
+                max_retries=Retry(
+                    total=MAX_RETRIES,
+                    backoff_factor=RETRY_BACKOFF,
+                    status_forcelist=RETRY_STATUSES,
+                    allowed_methods=frozenset(['GET']),
+                    respect_retry_after_header=True
+                )
+            ))
+            _session = session
+        return _session
+
+_HLEVEL = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+HEADING_TAGS = frozenset(_HLEVEL)
+LIST_TAGS = frozenset(('ul', 'ol'))
+
+# Only build the parts of each disease page the scraper reads
+DISEASE_STRAINER = SoupStrainer([*HEADING_TAGS, *LIST_TAGS, 'div', 'p', 'li'])
 
 # Canonical section names we want to collect
 TARGET_SECTIONS = [
@@ -31,103 +144,220 @@ SECTION_TITLE_VARIANTS = {
     'Society and culture': ['Society and culture', 'Society_and_culture', 'Culture and society', 'Society', 'Culture'],
 }
 
-def fetch_category_page(url):
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+class RateLimiter:
+    """Thread-safe token bucket: bursts of up to `rate` calls, refilled at `rate` per second.
+
+    Sync counterpart of the AsyncLimiter used by the async scraper. Callers only
+    block once the bucket is empty, instead of sleeping before every request.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.capacity = rate
+        self.tokens = rate
+        self.lock = threading.Lock()
+        self.last_time = time.monotonic()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_time) * self.rate)
+            self.last_time = now
+            # Take a token now; a negative balance reserves the caller's slot in the queue
+            self.tokens -= 1
+            wait_time = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+rate_limiter = RateLimiter(MAX_REQUESTS_PER_SECOND)
+
+
+def is_fresh_in_cache(url):
+    """True if a GET of `url` will be answered from the cache; expired entries still go to the network"""
+    cache = get_session().cache
+    response = cache.get_response(cache.create_key(requests.Request('GET', url)))
+    return response is not None and not response.is_expired
+
+
+def fetch_api_json(url, label):
+    """GET a MediaWiki API URL and decode it; None (with a message) on failure.
+
+    HTTP-level retries happen in the session's adapter; retryable API errors are
+    retried here with the same backoff, since they arrive as HTTP 200.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        if not is_fresh_in_cache(url):
+            rate_limiter.wait()  # Cache hits don't touch Wikipedia, so they skip the throttle
+        try:
+            response = get_session().get(url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
+            print(f"Error fetching {label}: {e}")
+            return None
+        error = data.get('error')
+        if error is None:
+            return data
+        if not is_retryable_api_error(error.get('code')) or attempt == MAX_RETRIES:
+            print(f"Error fetching {label}: {error.get('info', error.get('code'))}")
+            return None
+        time.sleep(retry_delay(attempt, response.headers))
+
+
+def fetch_category_page(cmcontinue=None):
+    """Fetch one batch (up to 500 titles) of category members as MediaWiki API JSON"""
+    params = {
+        'action': 'query',
+        'list': 'categorymembers',
+        'cmtitle': CATEGORY_TITLE,
+        'cmlimit': 500,
+        'cmtype': 'page',
+        'cmnamespace': 0,  # Articles only
+        'format': 'json',
     }
-
-    try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()  
-        soup = BeautifulSoup(response.text, 'html.parser')
-        return soup
-    except requests.RequestException as e:
-        print(f"Error fetching category page: {e}")
-        return None
-
-
-def extract_disease_urls(soup):
-    global disease_urls
-    category_div = soup.find('div', {'id': 'mw-pages'})
-    
-    if category_div:
-        category_groups = category_div.find_all('div', {'class': 'mw-category-group'})
-        
-        for group in category_groups:
-            links = group.find_all('a')
-            for link in links:
-                disease_name = link.get('title')
-                href = link.get('href')
-                
-                if disease_name and href and '/wiki/Category:' not in href and '/wiki/' in href:
-                    page_title = href.replace('/wiki/', '').replace('_', ' ')
-                    # Exclude non-articles like "List of ..."
-                    if disease_name.lower().startswith('list of'):
-                        continue
-                    # Use the page title derived from href to match the actual article path
-                    candidate = page_title or disease_name
-                    if candidate not in disease_urls:
-                        disease_urls.append(candidate)
+    if cmcontinue:
+        params['cmcontinue'] = cmcontinue
+    url = requests.Request('GET', API_URL, params=params).prepare().url
+    return fetch_api_json(url, 'category page')
+
+
+def extract_disease_urls(data):
+    """Collect disease titles from a categorymembers batch; returns the continue token, if any"""
+    for member in data.get('query', {}).get('categorymembers', []):
+        disease_name = member.get('title')
+        # Exclude non-articles like "List of ..."
+        if not disease_name or disease_name.lower().startswith('list of'):
+            continue
+        if disease_name not in seen_disease_urls:
+            seen_disease_urls.add(disease_name)
+            disease_urls.append(disease_name)
     
-    next_page_link = soup.find('a', string='next page')
-    if next_page_link:
-        next_url = next_page_link.get('href')
-        if next_url:
-            return f"https://en.wikipedia.org{next_url}"
-    return None
+    return data.get('continue', {}).get('cmcontinue')
     
 
-def fetch_wikipedia_data(disease):
-    encoded_disease = disease.replace(' ', '_')
-    url = BASE_URL + encoded_disease
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+def disease_page_url(disease):
+    """MediaWiki API URL for the rendered article body only: no skin, sidebars or edit links"""
+    params = {
+        'action': 'parse',
+        'page': disease,
+        'prop': 'text',
+        'redirects': 1,
+        'disableeditsection': 1,
+        'disablelimitreport': 1,
+        'format': 'json',
+        'formatversion': 2,
     }
-    
-    try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()  # Raise an error if the request failed
-        soup = BeautifulSoup(response.text, 'html.parser')
-        return soup
-    except requests.RequestException as e:
-        print(f"Error fetching {disease}: {e}")
+    return requests.Request('GET', API_URL, params=params).prepare().url
+
+
+def extract_article_html(data, disease):
+    """Pull the article HTML out of a decoded, error-free parse API response"""
+    html = data.get('parse', {}).get('text')
+    if html is None:
+        print(f"Error fetching {disease}: no article text returned")
+    return html
+
+
+def fetch_wikipedia_html(disease):
+    """Download the rendered HTML of a disease article's body"""
+    data = fetch_api_json(disease_page_url(disease), disease)
+    if data is None:
         return None
+    return extract_article_html(data, disease)
 
 
 def get_heading_level(tag):
-    if not hasattr(tag, 'name'):
-        return None
-    if tag.name and tag.name.startswith('h') and len(tag.name) == 2 and tag.name[1].isdigit():
-        return int(tag.name[1])
-    return None
+    return _HLEVEL.get(getattr(tag, 'name', None))
 
 
-def find_heading_for_titles(soup, titles):
-    """Find the first heading whose headline text matches any of the provided titles (case-insensitive)."""
-    def norm(s):
-        return ''.join(ch for ch in s.lower().strip() if ch.isalnum() or ch.isspace()).replace('  ', ' ')
-    normalized = [norm(t) for t in titles]
+_NORM_RE = re.compile(r'[^\w\s]|_')  # Everything except letters, digits and whitespace
 
-    # Prefer matching by the span.mw-headline id or text
-    for hx in ['h2', 'h3', 'h4', 'h5', 'h6']:
-        for heading in soup.find_all(hx):
-            span = heading.find('span', class_='mw-headline')
-            if span:
-                span_id = norm(span.get('id') or '')
-                span_text = norm(span.get_text())
-                if span_id in normalized or span_text in normalized:
-                    return heading
 
-    # Fallback: contains match on heading text
+@functools.lru_cache(maxsize=4096)
+def _norm_title(s):
+    """Lower-case, drop punctuation/underscores and collapse whitespace."""
+    return ' '.join(_NORM_RE.sub('', s.lower()).split())
+
+
+# SECTION_TITLE_VARIANTS normalized once at import
+_NORMALIZED_VARIANTS = {
+    canonical: tuple(_norm_title(v) for v in variants)
+    for canonical, variants in SECTION_TITLE_VARIANTS.items()
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _variations(section_title):
+    """Normalized title variants for a section, falling back to the title itself."""
+    return _NORMALIZED_VARIANTS.get(section_title) or (_norm_title(section_title),)
+
+
+def index_headings(soup):
+    """Index a page's headings with a single DOM pass.
+
+    Returns `(exact, ordered)`: `exact` maps normalized headline ids/texts to heading
+    nodes, and `ordered` lists `(normalized heading text, node)` in document order for
+    contains-matching. Both the span.mw-headline title (older markup) and the bare hX
+    text are indexed. When several headings normalize to the same title, the
+    highest-level one wins (h2 before h3, ...).
+
+    Note this differs from the old per-level scan, where any h2 matching any variant
+    beat every h3: lookup_heading now picks by variant priority first, so for
+    ['Treatment', 'Management'] an h3 "Treatment" wins over an h2 "Management".
+    """
+    exact = {}
+    levels = {}
+    ordered = []
     for heading in soup.find_all(['h2', 'h3', 'h4', 'h5', 'h6']):
-        text = norm(heading.get_text())
-        for t in normalized:
+        # Older markup keeps the title in span.mw-headline; newer markup puts the id on the hX itself
+        source = heading.find('span', class_='mw-headline') or heading
+        level = get_heading_level(heading)
+        for key in (_norm_title(source.get('id') or ''), _norm_title(source.get_text())):
+            if key and (key not in levels or level < levels[key]):
+                exact[key] = heading
+                levels[key] = level
+        ordered.append((_norm_title(heading.get_text()), heading))
+    return exact, ordered
+
+
+def lookup_heading(normalized_titles, heading_index):
+    """Return the heading for the first title (in variant priority order) with an exact match, else the first heading containing any title."""
+    exact, ordered = heading_index
+    for t in normalized_titles:
+        heading = exact.get(t)
+        if heading is not None:
+            return heading
+
+    # Fallback: contains match on heading text
+    for text, heading in ordered:
+        for t in normalized_titles:
             if t in text:
                 return heading
 
     return None
 
 
+def find_heading_for_titles(soup, titles, heading_index=None, prenormalized=False):
+    """Find the first heading whose headline text matches any of the provided titles (case-insensitive).
+
+    Pass a prebuilt `heading_index` (see index_headings) to avoid re-walking the DOM per lookup,
+    and `prenormalized=True` when `titles` already went through _norm_title.
+    """
+    normalized = titles if prenormalized else [_norm_title(t) for t in titles]
+    if heading_index is None:
+        heading_index = index_headings(soup)
+    return lookup_heading(normalized, heading_index)
+
+
+def next_element_siblings(node):
+    """Lazily yield the Tag siblings after node, skipping whitespace/text nodes.
+
+    Lazy on purpose: callers break at the next section, so the rest of the page is never visited.
+    """
+    return (sib for sib in node.next_siblings if isinstance(sib, Tag))
+
+
 def extract_section_with_subsections(heading):
     """Extract content after a heading, including content under deeper-level subheadings, stopping at the next heading of the same or higher level."""
     if not heading:
@@ -138,40 +368,38 @@ def extract_section_with_subsections(heading):
     heading_node = heading
     if wrapper:
         # In some pages, the <hX> is inside the wrapper
-        hx = wrapper.find(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+        hx = wrapper.find(HEADING_TAGS)
         if hx:
             heading_node = hx
 
     start_level = get_heading_level(heading_node) or 2
     parts = []
+    add_part = parts.append
 
     # Start after the wrapper if present; otherwise after the heading
-    current = (wrapper.next_sibling if wrapper is not None else heading.next_sibling)
-    while current is not None:
-        if hasattr(current, 'name'):
-            # Stop when encountering a new section heading of same or higher level
-            level = get_heading_level(current)
-            if level is not None and level <= start_level:
+    for current in next_element_siblings(wrapper if wrapper is not None else heading):
+        # Stop when encountering a new section heading of same or higher level
+        level = get_heading_level(current)
+        if level is not None and level <= start_level:
+            break
+        # If we hit another wrapper div for a heading, check its level
+        if current.name == 'div' and 'mw-heading' in (current.get('class') or ()):
+            next_h = current.find(HEADING_TAGS)
+            next_level = get_heading_level(next_h) if next_h else None
+            if next_level is not None and next_level <= start_level:
                 break
-            # If we hit another wrapper div for a heading, check its level
-            if current.name == 'div' and 'mw-heading' in current.get('class', []):
-                next_h = current.find(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-                next_level = get_heading_level(next_h) if next_h else None
-                if next_level is not None and next_level <= start_level:
-                    break
 
-            # Capture text content
-            if current.name == 'p':
-                text = current.get_text().strip()
-                if text:
-                    parts.append(text)
-        current = current.next_sibling
+        # Capture text content
+        if current.name == 'p':
+            text = current.get_text().strip()
+            if text:
+                add_part(text)
 
     return '\n'.join(parts) if parts else None
 
 
-def extract_section_by_header(soup, titles):
-    heading = find_heading_for_titles(soup, titles)
+def extract_section_by_header(soup, titles, heading_index=None, prenormalized=False):
+    heading = find_heading_for_titles(soup, titles, heading_index, prenormalized)
     content = extract_section_with_subsections(heading)
     if content:
         return content
@@ -183,28 +411,21 @@ def extract_section_by_header(soup, titles):
 def extract_content_after_heading(heading):
     """Extract all content following a heading until the next heading"""
     content_parts = []
+    add_part = content_parts.append
     
     parent = heading.find_parent('div', class_='mw-heading')
     
-    if parent:
-        current = parent.next_sibling
-    else:
-        current = heading.next_sibling
-    
-    while current:
-        if hasattr(current, 'name'):
-            if current.name == 'div' and 'mw-heading' in current.get('class', []):
-                break
-            
-            if current.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                break
-            
-            if current.name == 'p':
-                text = current.get_text().strip()
-                if text and len(text) > 0:
-                    content_parts.append(text)
+    for current in next_element_siblings(parent or heading):
+        if current.name == 'div' and 'mw-heading' in (current.get('class') or ()):
+            break
         
-        current = current.next_sibling
+        if current.name in HEADING_TAGS:
+            break
+        
+        if current.name == 'p':
+            text = current.get_text().strip()
+            if text and len(text) > 0:
+                add_part(text)
     
     return '\n'.join(content_parts) if content_parts else None
 
@@ -212,7 +433,7 @@ def extract_content_after_heading(heading):
 def find_all_sections(soup):
     """Debug function to find all section headings and their IDs"""
     sections = []
-    headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+    headings = soup.find_all(HEADING_TAGS)
     for heading in headings:
         section_id = heading.get('id', '')
         section_text = heading.get_text().strip()
@@ -228,15 +449,230 @@ def find_all_sections(soup):
             sections.append({'id': section_id, 'text': section_text})
     return sections
 
+def extract_sections(soup):
+    """Extract every canonical section found on a disease page."""
+    extracted = {}
+    heading_index = index_headings(soup)  # Walk the headings once per page
+    for canonical in TARGET_SECTIONS:
+        titles = _variations(canonical)
+        content = extract_section_by_header(soup, titles, heading_index, prenormalized=True)
+        if content:
+            extracted[canonical] = content
+    return extracted
+
+
+# Lexbor (selectolax) versions of the heading lookup and section walk above.
+# Same matching rules, but without BeautifulSoup's per-node Python objects.
+
+def _lexbor_classes(node):
+    return (node.attributes.get('class') or '').split()
+
+
+def _lexbor_index_headings(tree):
+    """Lexbor counterpart of index_headings."""
+    exact = {}
+    levels = {}
+    ordered = []
+    for heading in tree.css('h2, h3, h4, h5, h6'):
+        source = heading.css_first('span.mw-headline') or heading
+        level = _HLEVEL[heading.tag]
+        for key in (_norm_title(source.attributes.get('id') or ''), _norm_title(source.text())):
+            if key and (key not in levels or level < levels[key]):
+                exact[key] = heading
+                levels[key] = level
+        ordered.append((_norm_title(heading.text()), heading))
+    return exact, ordered
+
+
+def _lexbor_heading_wrapper(heading):
+    parent = heading.parent
+    while parent is not None:
+        if parent.tag == 'div' and 'mw-heading' in _lexbor_classes(parent):
+            return parent
+        parent = parent.parent
+    return None
+
+
+def _lexbor_section_text(heading, with_subsections):
+    """Collect <p> text after heading, like extract_section_with_subsections / extract_content_after_heading."""
+    wrapper = _lexbor_heading_wrapper(heading)
+    heading_node = heading
+    if wrapper is not None:
+        heading_node = wrapper.css_first('h1, h2, h3, h4, h5, h6') or heading
+    start_level = _HLEVEL.get(heading_node.tag) or 2
+
+    parts = []
+    current = (wrapper if wrapper is not None else heading).next
+    while current is not None:
+        tag = current.tag
+        level = _HLEVEL.get(tag)
+        if level is not None and (not with_subsections or level <= start_level):
+            break
+        if tag == 'div' and 'mw-heading' in _lexbor_classes(current):
+            if not with_subsections:
+                break
+            next_h = current.css_first('h1, h2, h3, h4, h5, h6')
+            next_level = _HLEVEL.get(next_h.tag) if next_h is not None else None
+            if next_level is not None and next_level <= start_level:
+                break
+        if tag == 'p':
+            text = current.text().strip()
+            if text:
+                parts.append(text)
+        current = current.next
+
+    return '\n'.join(parts) if parts else None
+
+
+def extract_sections_lexbor(tree):
+    """Lexbor counterpart of extract_sections."""
+    extracted = {}
+    heading_index = _lexbor_index_headings(tree)
+    for canonical in TARGET_SECTIONS:
+        titles = _variations(canonical)
+        heading = lookup_heading(titles, heading_index)
+        if heading is None:
+            continue
+        content = _lexbor_section_text(heading, True) or _lexbor_section_text(heading, False)
+        if content:
+            extracted[canonical] = content
+    return extracted
+
+
+def parse_disease_sections(html):
+    """Extract canonical sections from raw page HTML, preferring selectolax when installed."""
+    if LexborHTMLParser is not None:
+        return extract_sections_lexbor(LexborHTMLParser(html))
+    return extract_sections(BeautifulSoup(html, 'lxml', parse_only=DISEASE_STRAINER))
+
+
+async def fetch_wikipedia_html_async(session, disease, semaphore, limiter):
+    """Async counterpart of fetch_wikipedia_html, bounded by `semaphore` and rate-limited by `limiter`.
+
+    Mirrors the sync session's retry policy: RETRY_STATUSES, retryable API errors and
+    connection errors are retried up to MAX_RETRIES times with exponential backoff,
+    honouring Retry-After.
+    """
+    url = disease_page_url(disease)
+    async with semaphore:
+        for attempt in range(MAX_RETRIES + 1):
+            delay = RETRY_BACKOFF * (2 ** attempt)
+            try:
+                # get_response drops expired entries, so only fresh hits skip the limiter
+                if await session.cache.get_response(session.cache.create_key('GET', url)) is None:
+                    await limiter.acquire()  # Cache hits don't touch Wikipedia, so they skip the throttle
+                async with session.get(url) as response:
+                    if response.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                        delay = retry_delay(attempt, response.headers)
+                    else:
+                        response.raise_for_status()
+                        data = orjson.loads(await response.read())
+                        error = data.get('error')
+                        if error is None:
+                            return extract_article_html(data, disease)
+                        if not is_retryable_api_error(error.get('code')) or attempt == MAX_RETRIES:
+                            print(f"Error fetching {disease}: {error.get('info', error.get('code'))}")
+                            return None
+                        delay = retry_delay(attempt, response.headers)
+            except orjson.JSONDecodeError as e:
+                print(f"Error fetching {disease}: {e}")
+                return None
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == MAX_RETRIES:
+                    print(f"Error fetching {disease}: {e}")
+                    return None
+            except aiohttp.ClientError as e:
+                print(f"Error fetching {disease}: {e}")
+                return None
+            await asyncio.sleep(delay)
+
+
+async def scrape_disease_sections(session, disease_title, semaphore, limiter, parse_pool, results):
+    """Fetch one disease page, parse it in `parse_pool` so the event loop keeps fetching, and queue the result."""
+    html = await fetch_wikipedia_html_async(session, disease_title, semaphore, limiter)
+    extracted = None
+    if html is not None:
+        loop = asyncio.get_running_loop()
+        try:
+            extracted = await loop.run_in_executor(parse_pool, parse_disease_sections, html)
+        except Exception as e:  # Includes BrokenProcessPool; one bad page shouldn't stop the scrape
+            print(f"Error parsing {disease_title}: {e}")
+    await results.put((disease_title, extracted))
+
+
+async def write_records(results, total, stream_filename):
+    """Single writer: drain `results` until the None sentinel, appending qualifying records; returns the record count."""
+    scraped_count = 0
+    idx = 0
+    while True:
+        item = await results.get()
+        if item is None:
+            return scraped_count
+        disease_title, extracted = item
+        idx += 1
+        if extracted is None:
+            print(f"[{idx}/{total}] Failed to fetch '{disease_title}'")
+            continue
+
+        # Require at least four sections present
+        record = build_record(disease_title, extracted)
+        if record:
+            append_jsonl(record, filename=stream_filename)
+            scraped_count += 1
+            print(f"[{idx}/{total}] Scraped data for '{disease_title}'")
+        else:
+            print(f"[{idx}/{total}] Fewer than 4 required sections for '{disease_title}'; skipped")
+        print(f"  -> matched sections: {list(extracted.keys())}")
+
+
+async def scrape_disease_pages(titles, stream_filename):
+    """Scrape all titles concurrently, streaming each qualifying record to `stream_filename`; returns the record count.
+
+    Pages are parsed across MAX_PARSE_WORKERS processes; results still go through the single writer task.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    limiter = AsyncLimiter(MAX_REQUESTS_PER_SECOND, 1)
+    connector = aiohttp.TCPConnector(limit_per_host=MAX_CONNECTIONS_PER_HOST)
+    timeout = aiohttp.ClientTimeout(sock_connect=REQUEST_TIMEOUT[0], sock_read=REQUEST_TIMEOUT[1])
+    cache = SQLiteBackend(
+        ASYNC_CACHE_NAME,
+        expire_after=CACHE_EXPIRE_AFTER,
+        allowed_codes=(200,),
+        filter_fn=lambda response: API_ERROR_HEADER not in response.headers  # Body isn't read yet; MediaWiki always sets the header
+    )
+    results = asyncio.Queue()
+    # Spawn, not fork: by the first submit this process already runs the event loop and the cache's threads
+    with ProcessPoolExecutor(max_workers=MAX_PARSE_WORKERS, mp_context=multiprocessing.get_context('spawn')) as parse_pool:
+        async with CachedSession(cache=cache, connector=connector, timeout=timeout, headers=REQUEST_HEADERS) as session:
+            await session.cache.delete_expired_responses()
+            writer = asyncio.create_task(write_records(results, len(titles), stream_filename))
+            try:
+                await asyncio.gather(*(scrape_disease_sections(session, title, semaphore, limiter, parse_pool, results) for title in titles))
+            finally:
+                await results.put(None)  # Always release the writer so streamed records are flushed and counted
+            return await writer
+
+
+def build_record(disease_title, extracted):
+    """Build the output record, or None if fewer than four sections were found."""
+    if len(extracted) < 4:
+        return None
+    record = {'Disease': disease_title}
+    for canonical in TARGET_SECTIONS:
+        if canonical in extracted:
+            record[canonical] = extracted[canonical]
+    return record
+
 def save_to_json(data, filename="imprv_rare_diseases.json"):
-    with open(filename, mode='w', encoding='utf-8') as file:
-        json.dump(data, file, indent=2, ensure_ascii=False)
+    # orjson writes UTF-8 bytes directly and never escapes non-ASCII text
+    with open(filename, mode='wb') as file:
+        file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
 def load_existing_json(filename="imprv_rare_diseases.json"):
     """Load existing JSON file if it exists"""
     try:
-        with open(filename, mode='r', encoding='utf-8') as file:
-            return json.load(file)
+        with open(filename, mode='rb') as file:
+            return orjson.loads(file.read())
     except FileNotFoundError:
         return []
 
@@ -247,108 +683,133 @@ def append_to_json(new_data, filename="imprv_rare_diseases.json"):
     save_to_json(combined_data, filename)
     return combined_data
 
+def jsonl_path(filename):
+    """JSON Lines file that records are streamed to while scraping into `filename`"""
+    return os.path.splitext(filename)[0] + '.jsonl'
 
-def scrape_diseases(limit=200, output_filename="imprv_rare_diseases.json", offset=0, append=False):
-    # Collect all disease URLs from all pages
-    current_url = CATEGORY_URL
+def append_jsonl(record, filename="imprv_rare_diseases.jsonl"):
+    """Append a single record as one line; cost is O(record) regardless of file size"""
+    with open(filename, mode='ab') as file:
+        file.write(orjson.dumps(record) + b'\n')
+
+def load_jsonl(filename="imprv_rare_diseases.jsonl"):
+    """Load all records from a JSON Lines file if it exists, skipping lines that don't decode"""
+    records = []
+    try:
+        with open(filename, mode='rb') as file:
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(orjson.loads(line))
+                except orjson.JSONDecodeError as e:
+                    print(f"Skipping unreadable line {line_number} in '{filename}': {e}")
+    except FileNotFoundError:
+        pass
+    return records
+
+def truncate_partial_jsonl(filename="imprv_rare_diseases.jsonl", block_size=65536):
+    """Cut a trailing line without a newline (left by a crash mid-write) so later appends start on a fresh line"""
+    try:
+        with open(filename, mode='r+b') as file:
+            end = file.seek(0, os.SEEK_END)
+            pos = end
+            while pos > 0:
+                start = max(0, pos - block_size)
+                file.seek(start)
+                block = file.read(pos - start)
+                newline = block.rfind(b'\n')
+                if newline != -1:
+                    pos = start + newline + 1
+                    break
+                pos = start
+            if pos < end:
+                print(f"Dropping {end - pos} bytes of partial record at the end of '{filename}'.")
+                file.truncate(pos)
+    except FileNotFoundError:
+        pass
+
+
+def scrape_diseases(limit=200, output_filename="imprv_rare_diseases.json", offset=0, append=False, resume=True):
+    # Collect disease titles from the category via the MediaWiki API, 500 per request
     page_count = 0
+    cmcontinue = None
+    get_session().cache.delete(expired=True)
     
-    print("Collecting all disease URLs from category pages...")
+    print("Collecting all disease titles from the category...")
     
-    while current_url:
+    while True:
         page_count += 1
         print(f"Fetching page {page_count}...")
         
-        soup = fetch_category_page(current_url)
-        if not soup:
+        data = fetch_category_page(cmcontinue)
+        if not data:
             print(f"Failed to fetch page {page_count}.")
             break
         
-        next_url = extract_disease_urls(soup)
+        cmcontinue = extract_disease_urls(data)
         print(f"Found {len(disease_urls)} total diseases so far...")
         
         # Stop collecting if we reached enough to satisfy offset+limit
         if len(disease_urls) >= offset + limit:
             # Trim in case we overshot within a page
             del disease_urls[offset + limit:]
-            current_url = None
             break
         
-        if next_url:
-            current_url = next_url
-            time.sleep(random.uniform(0.5, 1))  # Small delay between page fetches
-        else:
-            current_url = None
+        if not cmcontinue:
+            break
     
     print(f"\nTotal diseases collected: {len(disease_urls)} from {page_count} pages.")
     
-    # Now scrape each disease page
-    disease_data = []
+    # Now scrape the disease pages concurrently. Records are streamed to a JSON
+    # Lines file as they complete, so a crash keeps everything collected so far;
+    # with `resume`, diseases already in that file are not fetched again.
+    stream_filename = jsonl_path(output_filename)
+    if resume:
+        truncate_partial_jsonl(stream_filename)
+        seen = {record['Disease'] for record in load_jsonl(stream_filename)}
+    else:
+        open(stream_filename, mode='w', encoding='utf-8').close()
+        seen = set()
 
     start_index = min(offset, len(disease_urls))
     end_index = min(len(disease_urls), offset + limit)
-    total_to_scrape = max(0, end_index - start_index)
-    for idx, i in enumerate(range(start_index, end_index), start=1):
-        disease_title = disease_urls[i]
-        print(f"[{idx}/{total_to_scrape}] Scraping data for '{disease_title}'...")
-        soup = fetch_wikipedia_data(disease_title)
-
-        if not soup:
-            time.sleep(random.uniform(1, 2))
-            continue
-
-        extracted = {}
-        for canonical in TARGET_SECTIONS:
-            titles = SECTION_TITLE_VARIANTS.get(canonical, [canonical])
-            content = extract_section_by_header(soup, titles)
-            if content:
-                extracted[canonical] = content
-
-        print(f"  -> matched sections: {list(extracted.keys())}")
-
-        # Require at least four sections present
-        if len(extracted) >= 4:
-            record = {'Disease': disease_title}
-            for canonical in TARGET_SECTIONS:
-                if canonical in extracted:
-                    record[canonical] = extracted[canonical]
-            disease_data.append(record)
-
-        time.sleep(random.uniform(1, 2))  # Delay between disease page fetches
-
-    # Save results
+    titles_to_scrape = disease_urls[start_index:end_index]
+    pending_titles = [title for title in titles_to_scrape if title not in seen]
+    if len(pending_titles) < len(titles_to_scrape):
+        print(f"Resuming: {len(titles_to_scrape) - len(pending_titles)} diseases already in '{stream_filename}'.")
+    scraped_count = asyncio.run(scrape_disease_pages(pending_titles, stream_filename))
+
+    # Merge this window's streamed records into the JSON array once, at the end, in category order
+    position = {title: i for i, title in enumerate(titles_to_scrape)}
+    disease_data = sorted(
+        (record for record in load_jsonl(stream_filename) if record['Disease'] in position),
+        key=lambda record: position[record['Disease']]
+    )
     if append:
         append_to_json(disease_data, filename=output_filename)
     else:
         save_to_json(disease_data, filename=output_filename)
     print(f"\n{'='*80}")
-    print(f"Successfully scraped {len(disease_data)} diseases from {page_count} category pages.")
+    print(f"Successfully scraped {len(disease_data)} diseases ({scraped_count} new) from {page_count} category pages.")
     print(f"Data saved to '{output_filename}'.")
     print("="*80)
 
 
 def scrape_single_disease(disease_title, output_filename="imprv_rare_diseases.json"):
     print(f"Scraping single article: '{disease_title}'...")
-    soup = fetch_wikipedia_data(disease_title)
-    if not soup:
+    html = fetch_wikipedia_html(disease_title)
+    if html is None:
         print("Failed to fetch article.")
         return []
 
-    extracted = {}
-    for canonical in TARGET_SECTIONS:
-        titles = SECTION_TITLE_VARIANTS.get(canonical, [canonical])
-        content = extract_section_by_header(soup, titles)
-        if content:
-            extracted[canonical] = content
+    extracted = parse_disease_sections(html)
 
     print(f"  -> matched sections: {list(extracted.keys())}")
 
     results = []
-    if len(extracted) >= 4:
-        record = {'Disease': disease_title}
-        for canonical in TARGET_SECTIONS:
-            if canonical in extracted:
-                record[canonical] = extracted[canonical]
+    record = build_record(disease_title, extracted)
+    if record:
         results.append(record)
         save_to_json(results, filename=output_filename)
         print(f"Saved 1 record to '{output_filename}'.")
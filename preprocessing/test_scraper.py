@@ -0,0 +1,36 @@
+from bs4 import BeautifulSoup
+
+import scraper
+
+# Canonical title listed first, alternative second: the h3 "Treatment" beats the h2 "Management"
+VARIANT_PRIORITY_HTML = (
+    '<h2>Management</h2><p>Mgmt text.</p>'
+    '<h3>Treatment</h3><p>Tx text.</p>'
+    '<h2>Prognosis</h2><p>Outlook.</p>'
+)
+VARIANT_PRIORITY_HTML_OLD_MARKUP = (
+    '<h2><span class="mw-headline" id="Management">Management</span></h2><p>Mgmt text.</p>'
+    '<h3><span class="mw-headline" id="Treatment">Treatment</span></h3><p>Tx text.</p>'
+    '<h2><span class="mw-headline" id="Prognosis">Prognosis</span></h2><p>Outlook.</p>'
+)
+
+
+def test_heading_lookup_prefers_variant_order_over_level():
+    for html in (VARIANT_PRIORITY_HTML, VARIANT_PRIORITY_HTML_OLD_MARKUP):
+        soup = BeautifulSoup(html, 'lxml')
+        heading = scraper.find_heading_for_titles(soup, ['Treatment', 'Management'])
+        assert heading.name == 'h3'
+        assert scraper.extract_section_by_header(soup, ['Treatment', 'Management']) == 'Tx text.'
+
+
+def test_heading_lookup_same_title_prefers_higher_level():
+    soup = BeautifulSoup('<h3>Treatment</h3><p>Sub.</p><h2>Treatment</h2><p>Main.</p>', 'lxml')
+    assert scraper.find_heading_for_titles(soup, ['Treatment']).name == 'h2'
+
+
+def test_lexbor_extraction_matches_beautifulsoup():
+    if scraper.LexborHTMLParser is None:
+        return
+    for html in (VARIANT_PRIORITY_HTML, VARIANT_PRIORITY_HTML_OLD_MARKUP):
+        soup = BeautifulSoup(html, 'lxml', parse_only=scraper.DISEASE_STRAINER)
+        assert scraper.extract_sections_lexbor(scraper.LexborHTMLParser(html)) == scraper.extract_sections(soup)